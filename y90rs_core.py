@@ -0,0 +1,244 @@
+"""Y90RS and MELD 3.0 scoring core shared by the Streamlit app"""
+import math
+from types import MappingProxyType
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Pure-Python fallback when numba is not installed
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# MELD 3.0 coefficients for ln(bilirubin), ln(INR), ln(creatinine)
+_MELD_COEF = np.array([1.42, 1.18, 3.09])
+# Unit divisors (μmol/L to mg/dL) and upper bounds for the same inputs
+_MELD_UNITS = np.array([17.1, 1.0, 88.4])
+_MELD_MAX = np.array([np.inf, np.inf, 4.0])
+
+# ln() over the mantissa range [0.5, 1]; other values are reduced with frexp
+_LOG_LUT_SIZE = 1024
+_LOG_LUT = np.log(np.linspace(0.5, 1.0, _LOG_LUT_SIZE + 1))
+_LN2 = math.log(2.0)
+
+@njit(cache=True)
+def _lut_log(x):
+    """Natural log of a positive float by table lookup with linear interpolation"""
+    m, e = math.frexp(x)
+    pos = (m - 0.5) * (2 * _LOG_LUT_SIZE)
+    i = int(pos)
+    return _LOG_LUT[i] + (pos - i) * (_LOG_LUT[i + 1] - _LOG_LUT[i]) + e * _LN2
+
+@njit(cache=True)
+def calculate_meld3(bilirubin, creatinine, inr, sodium, female=False):
+    """Calculate MELD 3.0 score"""
+    # Convert units and apply bounds
+    vals = np.clip(np.array([bilirubin, inr, creatinine]) / _MELD_UNITS, 1.0, _MELD_MAX)
+    sodium = max(125, min(137, sodium))
+    
+    # MELD 3.0 formula
+    meld3 = (1.33 * female) + (0.047 * (137 - sodium))
+    for k in range(3):
+        meld3 += _MELD_COEF[k] * _lut_log(vals[k])
+    
+    return round(float(meld3))
+
+# Portal vein status labels; portal_vein_status is the index, which is also the score
+PORTAL_VEIN_LABELS = (
+    "No thrombosis",
+    "Bland thrombosis",
+    "Segmental tumor thrombosis",
+    "Main/Lobar tumor thrombosis"
+)
+
+# Scoring cut-points; each threshold crossed adds one point
+_AFP_T = np.array([20.0, 400.0, 1000.0])
+_SHUNT_T = np.array([5.0, 10.0])
+_MELD_T = np.array([10, 14], dtype=np.int8)
+_ALBUMIN_T = np.array([35.0, 28.0])
+_ALT_AST_T = np.array([1.5, 2.0])
+_NLR_T = np.array([2.5, 4.0])
+_ECOG_T = np.array([1, 2], dtype=np.int8)
+
+# Size & volume points, indexed by [size bin, volume bin]:
+# size <=3 / <=5 / <=8 / >8 cm, volume <=100 / <=300 / <=500 / >500 cc
+_SIZE_T = np.array([3.0, 5.0, 8.0])
+_VOLUME_T = np.array([100.0, 300.0, 500.0])
+_SV_TABLE = np.array([
+    [0, 1, 2, 4],
+    [1, 1, 2, 4],
+    [2, 2, 2, 4],
+    [4, 4, 4, 4]
+], dtype=np.int8)
+
+@njit(cache=True)
+def calculate_y90rs(tumor_size, tumor_volume, afp, portal_vein_status, 
+                   shunt_fraction, meld3, albumin, alt_ast_ratio, nlr, ecog):
+    """Calculate Y90RS score"""
+    score = 0
+    
+    # 1. Tumor Burden Component (0-7 points)
+    # Size & Volume (0-4)
+    score += _SV_TABLE[np.sum(tumor_size > _SIZE_T), np.sum(tumor_volume > _VOLUME_T)]
+    
+    # AFP (0-3)
+    score += np.sum(afp > _AFP_T)
+    
+    # 2. Vascular Status (0-5 points)
+    # Portal Vein Status (0-3): the option index is the score
+    score += portal_vein_status
+    
+    # Shunt Fraction (0-2)
+    score += np.sum(shunt_fraction > _SHUNT_T)
+    
+    # 3. Liver Function/Reserve (0-6 points)
+    # MELD 3.0 (0-2)
+    score += np.sum(meld3 > _MELD_T)
+    
+    # Albumin (0-2), lower is worse
+    score += np.sum(albumin < _ALBUMIN_T)
+    
+    # ALT/AST ratio (0-2)
+    score += np.sum(alt_ast_ratio > _ALT_AST_T)
+    
+    # 4. Inflammatory/Performance Status (0-4 points)
+    # NLR (0-2)
+    score += np.sum(nlr > _NLR_T)
+    
+    # ECOG Status (0-2)
+    score += np.sum(ecog > _ECOG_T)
+    
+    return int(score)
+
+def calculate_y90rs_batch(df):
+    """Calculate Y90RS scores for a DataFrame of patients
+    
+    Columns are named after the calculate_y90rs arguments, with
+    portal_vein_status given as the option index. Returns one int16 score
+    per row.
+    """
+    def col(name):
+        return df[name].to_numpy()
+    
+    def points(thresholds, values):
+        return np.searchsorted(thresholds, values).astype(np.int8)
+    
+    # Component points are int8; the total (at most 22) is accumulated in int16
+    score = _SV_TABLE[points(_SIZE_T, col("tumor_size")),
+                      points(_VOLUME_T, col("tumor_volume"))].astype(np.int16)
+    score += points(_AFP_T, col("afp"))
+    score += col("portal_vein_status").astype(np.int8)
+    score += points(_SHUNT_T, col("shunt_fraction"))
+    score += points(_MELD_T, col("meld3"))
+    score += points(-_ALBUMIN_T, -col("albumin"))
+    score += points(_ALT_AST_T, col("alt_ast_ratio"))
+    score += points(_NLR_T, col("nlr"))
+    score += points(_ECOG_T, col("ecog"))
+    return score
+
+# Warm up the JIT so the first click does not pay compilation cost
+calculate_meld3(17.1, 88.4, 1.0, 137.0, False)
+calculate_y90rs(0.0, 0.0, 0.0, 0, 0.0, 0, 0.0, 0.0, 0.0, 0)
+
+# Treatment recommendations per risk category, built once at import (read-only)
+_RECS = MappingProxyType({
+    "Low Risk": MappingProxyType({
+        "Pre-treatment": (
+            "Standard pre-treatment workup",
+            "Consider single-session treatment",
+            "Standard liver function assessment",
+            "Optional multidisciplinary review"
+        ),
+        "Treatment": (
+            "Target dose: 120-150 Gy",
+            "Consider whole-lobe treatment if indicated",
+            "Standard personalized dosimetry",
+            "Single-session approach preferred",
+            "Consider selective/superselective approach"
+        ),
+        "Monitoring": (
+            "Follow-up imaging at 3 months",
+            "Liver function tests every 4-6 weeks",
+            "Consider AFP monitoring q3 months",
+            "Standard toxicity monitoring"
+        )
+    }),
+    "Intermediate Risk": MappingProxyType({
+        "Pre-treatment": (
+            "Mandatory multidisciplinary review",
+            "Detailed vascular mapping",
+            "Consider advanced liver function testing",
+            "Assess portal vein flow dynamics",
+            "Consider pre-treatment portal vein embolization"
+        ),
+        "Treatment": (
+            "Target dose: 100-120 Gy",
+            "Sequential lobar treatment recommended",
+            "Consider radiation segmentectomy for small lesions",
+            "Personalized dosimetry mandatory",
+            "Consider prophylactic antibiotics"
+        ),
+        "Monitoring": (
+            "Early follow-up imaging (6-8 weeks)",
+            "Liver function tests every 2-3 weeks",
+            "Monthly AFP monitoring",
+            "Enhanced toxicity monitoring",
+            "Consider admission for first treatment"
+        )
+    }),
+    "High Risk": MappingProxyType({
+        "Pre-treatment": (
+            "Extensive pre-treatment evaluation",
+            "Full performance status assessment",
+            "Detailed quality of life assessment",
+            "Consider alternative treatments",
+            "Mandatory portal pressure assessment",
+            "Detailed nutritional assessment"
+        ),
+        "Treatment": (
+            "Target dose: 80-100 Gy",
+            "Selective/superselective approach mandatory",
+            "Sequential treatment with 4-6 week interval",
+            "Consider dose reduction",
+            "Prophylactic antibiotics mandatory",
+            "Consider systemic therapy combination"
+        ),
+        "Monitoring": (
+            "Weekly monitoring first month",
+            "Imaging at 4-6 weeks",
+            "Biweekly liver function tests",
+            "Consider hospital admission",
+            "Enhanced toxicity monitoring",
+            "Early palliative care consultation"
+        )
+    })
+})
+
+# The same recommendations as one Markdown bullet list per section
+_RECS_MARKDOWN = MappingProxyType({
+    category: MappingProxyType({
+        section: "\n".join(f"- {rec}" for rec in recs)
+        for section, recs in sections.items()
+    })
+    for category, sections in _RECS.items()
+})
+
+def get_recommendations(risk_category):
+    """Get treatment recommendations based on risk category"""
+    return _RECS[risk_category]
+
+def get_recommendations_markdown(risk_category):
+    """Get treatment recommendations as Markdown bullet lists per section"""
+    return _RECS_MARKDOWN[risk_category]
+
+# (risk category, mortality risk) for scores <=6, 7-12 and >12
+_RISK_TABLE = (
+    ("Low Risk", "<10%"),
+    ("Intermediate Risk", "10-30%"),
+    ("High Risk", ">30%")
+)
+
+def classify(score):
+    """Get risk category and mortality risk for a Y90RS score"""
+    return _RISK_TABLE[int(score > 6) + int(score > 12)]